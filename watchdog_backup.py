@@ -6,8 +6,15 @@ import logging.handlers
 import subprocess
 import platform
 import shutil
-import schedule
+import stat
+import json
+import pickle
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 
 # Constants
 CONFIG_FILE = "config.txt"
@@ -15,7 +22,75 @@ LOG_FILE = "watchdog_backup.log"
 ROBOCOPY_LOG = "robocopy.log"
 MAX_ROBOCOPY_LOG_SIZE = 10 * 1024 * 1024  # 10 MB
 MAX_LOG_FILES = 10
+ROBOCOPY_STATUS = {
+    0: "No files copied (source and destination synchronized)",
+    1: "Files copied successfully",
+    2: "Extra files detected in destination",
+    3: "Copy incomplete (mismatched files)",
+    4: "Some files could not be copied",
+    5: "Copy incomplete (retry limit exceeded)",
+    6: "Some files could not be copied (retry limit exceeded)",
+    7: "Files copied, some mismatched files or retries"
+}
 LAST_COPY_FILE = ".last_copy_time"
+LAST_COPY_SIZE = 8  # bytes, little-endian mtime in nanoseconds
+O_BINARY = getattr(os, 'O_BINARY', 0)
+MAX_COPY_WORKERS = 8
+MTIME_TOLERANCE_NS = 2 * 1000 * 1000 * 1000  # FAT32 stores mtime with 2 sec resolution
+DISK_CACHE_TTL = 5  # seconds
+LINUX_LABEL_DIR = "/dev/disk/by-label"
+COPY_BUFFER_SIZE = 1024 * 1024  # 1 MB
+KERNEL_COPY_CHUNK = 1024 * 1024 * 1024  # 1 GB per copy_file_range/sendfile call
+FULL_SCAN_INTERVAL = 60 * 60  # 1 hour, safety net for missed notifications
+CHANGE_SETTLE_DELAY = 2  # seconds to let bursts of writes finish
+CHANGE_EVENT_TYPES = {'created', 'deleted', 'modified', 'moved', 'closed'}
+PROBE_CACHE_FILE = "probes.json"
+PROBE_CACHE_TTL = 24 * 60 * 60  # 24 hours
+SCAN_CACHE_FILE = "scan_cache.pkl"
+SCAN_CACHE_TTL = 24 * 60 * 60  # 24 hours
+SCAN_CACHE_MAX_ENTRIES = 100000
+
+
+class ScanCache:
+    """Persistent record of source files already verified at destination"""
+
+    def __init__(self, path=SCAN_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, 'rb') as f:
+                self.entries = pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.getLogger('BackupLogger').warning(f"Scan cache ignored: {e}")
+
+    def is_synced(self, src_path, dst_path, src_stat):
+        """Check if source file is unchanged since it was last verified"""
+        entry = self.entries.get((src_path, dst_path))
+        return (entry is not None and time.time() - entry[2] < SCAN_CACHE_TTL and
+                entry[:2] == (src_stat.st_size, src_stat.st_mtime_ns))
+
+    def mark_synced(self, src_path, dst_path, src_stat):
+        """Remember source file state after destination was verified"""
+        self.entries[(src_path, dst_path)] = (src_stat.st_size, src_stat.st_mtime_ns, time.time())
+
+    def save(self):
+        """Evict stale entries and write cache to disk"""
+        cutoff = time.time() - SCAN_CACHE_TTL
+        entries = {key: value for key, value in self.entries.items() if value[2] >= cutoff}
+        if len(entries) > SCAN_CACHE_MAX_ENTRIES:
+            newest = sorted(entries.items(), key=lambda item: item[1][2])[-SCAN_CACHE_MAX_ENTRIES:]
+            entries = dict(newest)
+        self.entries = entries
+
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.getLogger('BackupLogger').warning(f"Failed to save scan cache: {e}")
 
 
 def setup_logging():
@@ -25,7 +100,8 @@ def setup_logging():
 
     # Main log file with rotation
     handler = logging.handlers.TimedRotatingFileHandler(
-        LOG_FILE, when='midnight', backupCount=MAX_LOG_FILES
+        LOG_FILE, when='midnight', backupCount=MAX_LOG_FILES,
+        delay=True, encoding='utf-8'
     )
     handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
     logger.addHandler(handler)
@@ -38,85 +114,160 @@ def setup_logging():
     return logger
 
 
+def probe_tool(name):
+    """Check if tool is on PATH, using on-disk cache that survives restarts"""
+    try:
+        with open(PROBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            probes = json.load(f)
+    except (OSError, ValueError):
+        probes = {}
+
+    cached = probes.get(name)
+    if isinstance(cached, dict) and time.time() - cached.get('ts', 0) < PROBE_CACHE_TTL:
+        return bool(cached.get('available'))
+
+    available = shutil.which(name) is not None
+    probes[name] = {'available': available, 'ts': time.time()}
+    try:
+        with open(PROBE_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(probes, f)
+    except OSError as e:
+        logging.getLogger('BackupLogger').warning(f"Failed to save probe cache: {e}")
+    return available
+
+
 def is_robocopy_available():
     """Check Robocopy availability with result caching"""
     if not hasattr(is_robocopy_available, 'available'):
-        try:
-            subprocess.run(["robocopy", "/?"],
-                           stdout=subprocess.DEVNULL,
-                           stderr=subprocess.DEVNULL)
-            is_robocopy_available.available = True
-        except:
-            is_robocopy_available.available = False
+        is_robocopy_available.available = probe_tool("robocopy")
     return is_robocopy_available.available
 
 
+def _unescape_mount_field(value):
+    """Decode octal escapes used in /proc/mounts and hex escapes in udev names"""
+    value = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), value)
+    return re.sub(r'\\x([0-9a-fA-F]{2})', lambda m: chr(int(m.group(1), 16)), value)
+
+
+def _windows_label_matches(drive, disk_name):
+    """Check volume label of a single drive root using kernel32"""
+    label = ctypes.create_unicode_buffer(261)
+    if ctypes.windll.kernel32.GetVolumeInformationW(drive, label, len(label), None, None, None, None, 0):
+        return disk_name.upper() in label.value.upper()
+    return False
+
+
+def _find_windows_drive(disk_name):
+    """Find drive root by volume label using kernel32"""
+    buffer = ctypes.create_unicode_buffer(512)
+    length = ctypes.windll.kernel32.GetLogicalDriveStringsW(len(buffer), buffer)
+    for drive in buffer[:length].split('\0'):
+        if drive and _windows_label_matches(drive, disk_name):
+            return drive
+    return None
+
+
+def _linux_label_devices(disk_name):
+    """Get block devices whose udev label link matches disk name"""
+    devices = set()
+    for name in os.listdir(LINUX_LABEL_DIR):
+        if disk_name in _unescape_mount_field(name):
+            devices.add(os.path.realpath(os.path.join(LINUX_LABEL_DIR, name)))
+    return devices
+
+
+def _is_drive_still_connected(drive, disk_name):
+    """Cheap check that previously found drive is still mounted with the same label"""
+    if platform.system() == "Windows":
+        return _windows_label_matches(drive, disk_name)
+    if not os.path.isdir(LINUX_LABEL_DIR):
+        # No cheap way to verify the label, do a full lookup
+        return False
+
+    # A mounted filesystem reports its block device number as st_dev
+    try:
+        drive_dev = os.stat(drive).st_dev
+        return any(os.stat(device).st_rdev == drive_dev for device in _linux_label_devices(disk_name))
+    except OSError:
+        return False
+
+
+def _find_linux_mount(disk_name):
+    """Find mount point by volume label using udev links and /proc/mounts"""
+    devices = _linux_label_devices(disk_name)
+    if devices:
+        with open("/proc/mounts", 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 1 and os.path.realpath(fields[0]) in devices:
+                    return _unescape_mount_field(fields[1])
+    return None
+
+
 def is_disk_connected(disk_name):
-    """Check if disk is connected"""
+    """Check if disk is connected (result cached for a few seconds)"""
+    if not hasattr(is_disk_connected, 'cache'):
+        is_disk_connected.cache = {}
+    cached = is_disk_connected.cache.get(disk_name)
+    if cached and time.monotonic() - cached[0] < DISK_CACHE_TTL:
+        return cached[1]
+
+    drive = None
     try:
-        if platform.system() == "Windows":
-            import win32api
-            drives = [f"{d}:\\" for d in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if os.path.exists(f"{d}:\\")]
-            for drive in drives:
-                try:
-                    vol_name = win32api.GetVolumeInformation(drive)[0]
-                    if disk_name.upper() in vol_name.upper():
-                        return drive
-                except:
-                    continue
+        # Re-check the last known drive before enumerating all of them
+        if cached and cached[1] and _is_drive_still_connected(cached[1], disk_name):
+            drive = cached[1]
+        elif platform.system() == "Windows":
+            drive = _find_windows_drive(disk_name)
+        elif os.path.isdir(LINUX_LABEL_DIR):
+            drive = _find_linux_mount(disk_name)
         else:
-            # For Linux/Mac
+            # For systems without udev label links
             result = subprocess.run(["lsblk", "-o", "LABEL,MOUNTPOINT", "-n"],
                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                                     text=True, check=True)
             for line in result.stdout.splitlines():
                 if disk_name in line:
-                    return line.split()[-1]
+                    drive = line.split()[-1]
+                    break
     except Exception as e:
         logging.error(f"Disk check error: {str(e)}")
-    return None
+
+    is_disk_connected.cache[disk_name] = (time.monotonic(), drive)
+    return drive
 
 
 def check_rsync_available():
     """Check rsync availability with result caching"""
     if not hasattr(check_rsync_available, 'available'):
-        try:
-            subprocess.run(["rsync", "--version"],
-                           stdout=subprocess.DEVNULL,
-                           stderr=subprocess.DEVNULL,
-                           check=True)
-            check_rsync_available.available = True
-        except:
-            check_rsync_available.available = False
+        check_rsync_available.available = probe_tool("rsync")
     return check_rsync_available.available
 
 
 def get_dir_mtime(path):
-    """Get directory last modification time (recursively)"""
-    if not os.path.exists(path):
+    """Get directory last modification time in nanoseconds (recursively)"""
+    try:
+        max_mtime = os.stat(path).st_mtime_ns
+    except OSError:
         return 0
 
-    max_mtime = os.path.getmtime(path)
-
-    for root, dirs, files in os.walk(path):
-        for f in files:
-            try:
-                file_mtime = os.path.getmtime(os.path.join(root, f))
-                if file_mtime > max_mtime:
-                    max_mtime = file_mtime
-            except:
-                continue
+    # Directory mtimes catch added/removed/renamed entries, file mtimes catch edits.
+    # Same walk as the Python copy, so symlinked content is checked too;
+    # problems are reported by the copy walk, not on every check.
+    for _, _, entry_stat in _scandir_rec(path):
+        if entry_stat.st_mtime_ns > max_mtime:
+            max_mtime = entry_stat.st_mtime_ns
 
     return max_mtime
 
 
 def rotate_robocopy_log():
     """Check and rotate log file in necessary"""
-    if not os.path.exists(ROBOCOPY_LOG):
-        return
-
     # Check log file size
-    if os.path.getsize(ROBOCOPY_LOG) < MAX_ROBOCOPY_LOG_SIZE:
+    try:
+        if os.path.getsize(ROBOCOPY_LOG) < MAX_ROBOCOPY_LOG_SIZE:
+            return
+    except FileNotFoundError:
         return
 
     # Generate new file name for old log file
@@ -128,13 +279,11 @@ def rotate_robocopy_log():
         os.rename(ROBOCOPY_LOG, rotated_log)
 
         # Delete old log files
-        log_files = sorted(
-            [f for f in os.listdir() if f.startswith("robocopy_") and f.endswith(".log")],
-            key=os.path.getctime
-        )
+        # Timestamped names sort chronologically, no need to stat each file
+        log_files = sorted(Path().glob("robocopy_????????_??????.log"))
 
         while len(log_files) >= MAX_LOG_FILES:
-            os.remove(log_files.pop(0))
+            log_files.pop(0).unlink(missing_ok=True)
 
     except Exception as e:
         print(f"Log rotation error: {e}")
@@ -171,16 +320,7 @@ def copy_with_robocopy(src, dst, logger):
         )
 
         if result.returncode <= 7:
-            status_msg = {
-                0: "No files copied (source and destination synchronized)",
-                1: "Files copied successfully",
-                2: "Extra files detected in destination",
-                3: "Copy incomplete (mismatched files)",
-                4: "Some files could not be copied",
-                5: "Copy incomplete (retry limit exceeded)",
-                6: "Some files could not be copied (retry limit exceeded)",
-                7: "Files copied, some mismatched files or retries"
-            }.get(result.returncode, "Copy completed with warnings")
+            status_msg = ROBOCOPY_STATUS.get(result.returncode, "Copy completed with warnings")
 
             logger.info(f"Robocopy status: {status_msg} (return code {result.returncode})")
             return True
@@ -203,7 +343,8 @@ def copy_with_rsync(src, dst, logger):
             src += '/'
 
         result = subprocess.run(
-            ["rsync", "-avh", "--progress", "--update", "--itemize-changes", src, dst],
+            # No -v/--progress: only itemized change lines are used
+            ["rsync", "-ah", "--update", "--itemize-changes", src, dst],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
@@ -225,42 +366,199 @@ def copy_with_rsync(src, dst, logger):
         return False
 
 
-def copy_with_python(src, dst, logger):
+def _copy_fd_linux(src_fd, dst_fd):
+    """Copy file descriptor contents inside the kernel"""
+    copy_funcs = []
+    if hasattr(os, 'copy_file_range'):
+        copy_funcs.append(lambda: os.copy_file_range(src_fd, dst_fd, KERNEL_COPY_CHUNK))
+    copy_funcs.append(lambda: os.sendfile(dst_fd, src_fd, None, KERNEL_COPY_CHUNK))
+
+    src_size = os.fstat(src_fd).st_size
+    for copy_chunk in copy_funcs:
+        copied = 0
+        try:
+            while True:
+                sent = copy_chunk()
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError:
+            # Not supported for this kernel/filesystem pair: try the next method
+            if copied:
+                raise
+            continue
+
+        # Some filesystems report EOF right away for non-empty files: try the next method
+        if copied or not src_size:
+            return
+
+    raise OSError("Kernel copy is not supported")
+
+
+def _fast_copy(src, dst):
+    """Copy file with timestamps, keeping data out of Python buffers"""
+    system = platform.system()
+    if system == "Windows":
+        # CopyFileExW preserves timestamps and attributes by itself
+        cancel = ctypes.c_int(0)
+        if not ctypes.windll.kernel32.CopyFileExW(src, dst, None, None, ctypes.byref(cancel), 0):
+            raise ctypes.WinError()
+        return
+
+    if system == "Linux":
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                _copy_fd_linux(fsrc.fileno(), fdst.fileno())
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+        shutil.copystat(src, dst)
+        return
+
+    shutil.copy2(src, dst)
+
+
+def _scandir_rec(root, scan_errors=None, logger=None):
+    """Iteratively yield (path, relative path, stat) under root, collecting unscannable paths"""
+    # Every scanned path starts with root, so relative path is a plain slice
+    prefix_len = len(os.path.join(root, ''))
+    # Symlinked directories are followed; remember their targets to avoid loops
+    visited_links = {os.path.realpath(root)}
+    pending = [root]
+    while pending:
+        dir_path = pending.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            if entry.is_symlink():
+                                target = os.path.realpath(entry.path)
+                                if target in visited_links:
+                                    if logger:
+                                        logger.warning(f"Symlink loop, skipping directory: {entry.path}")
+                                    continue
+                                visited_links.add(target)
+                            pending.append(entry.path)
+                        elif not entry.is_file():
+                            if logger and entry.is_symlink():
+                                logger.warning(f"Broken symlink, skipping: {entry.path}")
+                            continue
+                        # DirEntry.stat() is filled in by the directory scan on Windows
+                        yield entry.path, entry.path[prefix_len:], entry.stat()
+                    except OSError as e:
+                        if logger:
+                            logger.error(f"Scan error, skipping file: {entry.path}: {e}")
+                        if scan_errors is not None:
+                            scan_errors.append(entry.path)
+        except OSError as e:
+            if logger:
+                logger.error(f"Scan error, skipping directory: {dir_path}: {e}")
+            if scan_errors is not None:
+                scan_errors.append(dir_path)
+
+
+def copy_with_python(src, dst, logger, scan_cache=None):
     """Fallback copy method using pure Python"""
     try:
-        if not os.path.exists(dst):
-            os.makedirs(dst, exist_ok=True)
+        os.makedirs(dst, exist_ok=True)
 
-        copied_files = 0
         skipped_files = 0
-        for item in os.listdir(src):
-            src_path = os.path.join(src, item)
-            dst_path = os.path.join(dst, item)
-
-            if os.path.isdir(src_path):
-                sub_copied, sub_skipped = copy_with_python(src_path, dst_path, logger)
-                copied_files += sub_copied
-                skipped_files += sub_skipped
+        files_to_copy = []
+        dirs_needed = set()
+        scan_errors = []
+        for src_path, rel_path, src_stat in _scandir_rec(src, scan_errors, logger):
+            dst_path = os.path.join(dst, rel_path)
+
+            # Directories are created even when empty, like robocopy /E and rsync -a
+            if stat.S_ISDIR(src_stat.st_mode):
+                dirs_needed.add(dst_path)
+                continue
+
+            # Unchanged since the last verified sync: skip destination stat
+            if scan_cache is not None and scan_cache.is_synced(src_path, dst_path, src_stat):
+                skipped_files += 1
+                continue
+
+            try:
+                dst_stat = os.stat(dst_path)
+                need_copy = (src_stat.st_size != dst_stat.st_size or
+                             src_stat.st_mtime_ns > dst_stat.st_mtime_ns + MTIME_TOLERANCE_NS)
+            except FileNotFoundError:
+                need_copy = True
+
+            if need_copy:
+                files_to_copy.append((src_path, dst_path, src_stat))
             else:
-                if (not os.path.exists(dst_path) or
-                        (os.path.getmtime(src_path) > os.path.getmtime(dst_path)) or
-                        (os.path.getsize(src_path) != os.path.getsize(dst_path))):
-                    shutil.copy2(src_path, dst_path)
+                skipped_files += 1
+                if scan_cache is not None:
+                    scan_cache.mark_synced(src_path, dst_path, src_stat)
+
+        # Create each destination directory once, parents first
+        for dir_path in sorted(dirs_needed, key=len):
+            os.makedirs(dir_path, exist_ok=True)
+
+        copied_files = 0
+        # Unscanned paths count as failures so the run is retried
+        failed_files = len(scan_errors)
+        if files_to_copy:
+            with ThreadPoolExecutor(max_workers=min(MAX_COPY_WORKERS, len(files_to_copy))) as executor:
+                futures = {
+                    executor.submit(_fast_copy, src_path, dst_path): (src_path, dst_path, src_stat)
+                    for src_path, dst_path, src_stat in files_to_copy
+                }
+                for future in as_completed(futures):
+                    src_path, dst_path, src_stat = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Copy error: {src_path}: {e}")
+                        failed_files += 1
+                        continue
+
                     logger.debug(f"Copied: {src_path}")
                     copied_files += 1
-                else:
-                    skipped_files += 1
+                    if scan_cache is not None:
+                        scan_cache.mark_synced(src_path, dst_path, src_stat)
+
+        logger.info(f"Total: {copied_files} copied, {skipped_files} skipped, {failed_files} failed")
 
-                logger.info(f"Total: {copied_files} copied, {skipped_files} skipped")
-        return (copied_files, skipped_files)
+        if scan_cache is not None:
+            scan_cache.save()
+        return (copied_files, skipped_files, failed_files)
 
     except Exception as e:
         logger.error(f"Copy error: {e}")
-        return (0, 0)
+        return (0, 0, 1)
 
 
-def copy_files(src, dst, logger):
-    """Main copy function with change verification"""
+def read_last_copy_time(path):
+    """Read saved source mtime in nanoseconds"""
+    fd = os.open(path, os.O_RDONLY | O_BINARY)
+    try:
+        data = os.read(fd, 64)
+    finally:
+        os.close(fd)
+
+    if len(data) == LAST_COPY_SIZE:
+        return int.from_bytes(data, 'little')
+    # Older versions stored float seconds as text
+    return int(float(data.decode('ascii')) * 1_000_000_000)
+
+
+def write_last_copy_time(path, mtime_ns):
+    """Save source mtime in nanoseconds as fixed-size binary value"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY)
+    try:
+        os.write(fd, mtime_ns.to_bytes(LAST_COPY_SIZE, 'little'))
+    finally:
+        os.close(fd)
+
+
+def copy_files(src, dst, logger, scan_cache=None):
+    """Main copy function with change verification, returns False if copy failed"""
     try:
         # Get current source modification time
         current_mtime = get_dir_mtime(src)
@@ -271,15 +569,13 @@ def copy_files(src, dst, logger):
 
         # Check if copying is needed
         need_copy = True
-        if os.path.exists(last_copy_path):
-            try:
-                with open(last_copy_path, 'r') as f:
-                    last_mtime = float(f.read())
-                    if current_mtime <= last_mtime:
-                        logger.info("No changes detected, copying not required")
-                        need_copy = False
-            except:
-                pass
+        try:
+            if current_mtime <= read_last_copy_time(last_copy_path):
+                logger.info("No changes detected, copying not required")
+                need_copy = False
+        except (OSError, ValueError):
+            # Missing or unreadable file means copy is needed
+            pass
 
         if need_copy:
             logger.info(f"Changes detected in {src}, starting copy...")
@@ -295,16 +591,16 @@ def copy_files(src, dst, logger):
                     success = copy_with_rsync(src, dst, logger)
                 else:
                     logger.info("Using Python for copying")
-                    copied, _ = copy_with_python(src, dst, logger)
-                    success = copied > 0
+                    # Nothing to copy is still a success, e.g. a new empty folder
+                    _, _, failed = copy_with_python(src, dst, logger, scan_cache)
+                    success = failed == 0
 
             # Save last copy time only on success
             if success:
                 try:
                     if platform.system() == "Windows":
                         ctypes.windll.kernel32.SetFileAttributesW(last_copy_path, 0x80)
-                    with open(last_copy_path, 'w') as f:
-                        f.write(str(current_mtime))
+                    write_last_copy_time(last_copy_path, current_mtime)
                     if platform.system() == "Windows":
                         ctypes.windll.kernel32.SetFileAttributesW(last_copy_path, 2)
                 except:
@@ -313,18 +609,26 @@ def copy_files(src, dst, logger):
             elapsed = time.time() - start_time
             status = "successfully" if success else "with errors"
             logger.info(f"Copy completed {status} in {elapsed:.2f} seconds")
+            return success
+
+        return True
 
     except Exception as e:
         logger.error(f"Copy error: {e}")
+        return False
+
+
+@dataclass
+class BackupConfig:
+    """Backup service settings loaded from CONFIG_FILE"""
+    disk_name: str = ''
+    scan_interval: int = 300
+    copy_pairs: list = field(default_factory=list)
 
 
 def read_config(logger):
     """Read configuration with validation"""
-    config = {
-        'disk_name': '',
-        'scan_interval': 300,
-        'copy_pairs': []
-    }
+    config = BackupConfig()
 
     required_fields = ['disk_name', 'copy_pairs']
 
@@ -342,24 +646,24 @@ def read_config(logger):
                     key = key.upper()
 
                     if key == 'DRIVE_LABEL':
-                        config['disk_name'] = value
+                        config.disk_name = value
                     elif key == 'SCAN_INTERVAL':
                         try:
-                            config['scan_interval'] = max(10, int(value))  # Minimum 10 seconds
+                            config.scan_interval = max(10, int(value))  # Minimum 10 seconds
                         except ValueError:
-                            logger.warning(f"Invalid interval, using default {config['scan_interval']} sec")
+                            logger.warning(f"Invalid interval, using default {config.scan_interval} sec")
 
                 elif '->' in line:
                     src, dst = map(str.strip, line.split('->', 1))
                     if os.path.exists(src):
-                        config['copy_pairs'].append({'source': src, 'destination': dst})
+                        config.copy_pairs.append({'source': src, 'destination': dst})
                     else:
                         logger.warning(f"Source doesn't exist: {src}")
 
         # Validate required fields
-        for field in required_fields:
-            if not config[field]:
-                raise ValueError(f"Required field missing: {field}")
+        for field_name in required_fields:
+            if not getattr(config, field_name):
+                raise ValueError(f"Required field missing: {field_name}")
 
         logger.info("=== Configuration loaded ===")
         return config
@@ -372,17 +676,46 @@ def read_config(logger):
         raise
 
 
+def start_change_observer(paths, changed, logger):
+    """Watch source directories and set event on any change"""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        logger.info("watchdog package not available, using periodic scan only")
+        return None
+
+    class ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # Ignore open/close-without-write events caused by reading sources
+            if event.event_type in CHANGE_EVENT_TYPES:
+                changed.set()
+
+    try:
+        observer = Observer()
+        handler = ChangeHandler()
+        for path in paths:
+            observer.schedule(handler, path, recursive=True)
+        observer.daemon = True
+        observer.start()
+        return observer
+    except Exception as e:
+        logger.warning(f"Change notifications unavailable, using periodic scan only: {e}")
+        return None
+
+
 def main():
-    """Main function with task scheduler"""
+    """Main function with change-driven scheduler"""
     logger = setup_logging()
     logger.info("\n=== Starting backup service ===")
+    observer = None
 
     try:
         config = read_config(logger)
         logger.info(f"Configuration:\n"
-                    f"Disk label: {config['disk_name']}\n"
-                    f"Scan interval: {config['scan_interval']} sec\n"
-                    f"Copy paths: {config['copy_pairs']}")
+                    f"Disk label: {config.disk_name}\n"
+                    f"Scan interval: {config.scan_interval} sec\n"
+                    f"Copy paths: {config.copy_pairs}")
 
         # Check copy tools availability
         if platform.system() == "Windows":
@@ -390,36 +723,67 @@ def main():
         else:
             logger.info(f"Rsync available: {'Yes' if check_rsync_available() else 'No'}")
 
+        scan_cache = ScanCache()
+        sources_changed = threading.Event()
+        observer = start_change_observer([pair['source'] for pair in config.copy_pairs],
+                                         sources_changed, logger)
+        state = {'checked': False, 'disk_path': None, 'last_full_scan': 0, 'retry': False}
+
         def job():
-            """Scheduled job"""
+            """Copy sources if disk is connected and something may have changed"""
+            disk_path = None
             try:
-                disk_path = is_disk_connected(config['disk_name'])
+                # Clear only a set event: anything arriving later is still pending,
+                # anything arriving before the clear is covered by the scan below
+                changed = sources_changed.is_set()
+                if changed:
+                    sources_changed.clear()
+
+                disk_path = is_disk_connected(config.disk_name)
                 if disk_path:
-                    logger.info(f"Disk {config['disk_name']} connected: {disk_path}")
-                    for pair in config['copy_pairs']:
-                        copy_files(pair['source'], os.path.join(disk_path, pair['destination']), logger)
-                else:
-                    logger.info(f"Disk {config['disk_name']} not connected")
+                    # Without a notification or a disk reconnect there is nothing new to copy
+                    full_scan_due = time.monotonic() - state['last_full_scan'] >= FULL_SCAN_INTERVAL
+                    if (observer and state['checked'] and not changed and not full_scan_due
+                            and not state['retry'] and disk_path == state['disk_path']):
+                        return
+
+                    logger.info(f"Disk {config.disk_name} connected: {disk_path}")
+                    state['last_full_scan'] = time.monotonic()
+                    results = [copy_files(pair['source'], os.path.join(disk_path, pair['destination']),
+                                          logger, scan_cache)
+                               for pair in config.copy_pairs]
+                    # Failed copies are retried on the next scan interval
+                    state['retry'] = not all(results)
+                elif not observer or not state['checked'] or disk_path != state['disk_path']:
+                    logger.info(f"Disk {config.disk_name} not connected")
             except Exception as e:
                 logger.error(f"Copy job error: {str(e)}")
-
-        # Schedule setup
-        schedule.every(config['scan_interval']).seconds.do(job)
+                state['retry'] = True
+            finally:
+                state['checked'] = True
+                state['disk_path'] = disk_path
 
         # First run immediately
         job()
 
-        # Main schedule loop
+        # Wake on source change notification or after scan interval for drive check
         while True:
-            schedule.run_pending()
-            time.sleep(1)
+            deadline = time.monotonic() + config.scan_interval
+            # Short waits keep Ctrl+C responsive on Windows
+            while not sources_changed.wait(1) and time.monotonic() < deadline:
+                pass
+            if sources_changed.is_set():
+                time.sleep(CHANGE_SETTLE_DELAY)
+            job()
 
     except KeyboardInterrupt:
         logger.info("Interrupt signal received")
     except Exception as e:
         logger.error(f"Critical error: {str(e)}")
     finally:
-        schedule.clear()
+        if observer:
+            observer.stop()
+            observer.join()
         logger.info("=== Service stopped ===\n")
 
 